@@ -0,0 +1,12 @@
+# Gunicorn settings — picked up automatically from the working directory.
+# Bind address comes from the Dockerfile CMD ($PORT).
+
+# One process with a thread pool: endpoints are mostly DB / network bound,
+# and the in-process response caches (services/cache.py) and the upload
+# background worker assume a single process
+workers = 1
+worker_class = "gthread"
+threads = 8
+
+# Heartbeat file on tmpfs so a slow container disk can't stall workers
+worker_tmp_dir = "/dev/shm"
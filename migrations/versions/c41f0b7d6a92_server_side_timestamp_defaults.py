@@ -0,0 +1,35 @@
+"""server-side timestamp defaults
+
+Revision ID: c41f0b7d6a92
+Revises: e522f2697e39
+Create Date: 2026-10-14 17:40:02.511318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f0b7d6a92'
+down_revision = 'e522f2697e39'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs stamped by the database instead of the app
+TIMESTAMP_COLUMNS = [
+    ('snapshots', 'created_at'),
+    ('portfolio_analyses', 'created_at'),
+    ('ticker_classifications', 'classified_at'),
+]
+
+
+def upgrade():
+    for table, column in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade():
+    for table, column in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, server_default=None)
@@ -1,6 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+# Reads never wait on an autoflush check; writes flush explicitly (or commit).
+# No expire-on-commit, so returning an object after commit needs no reload.
+db = SQLAlchemy(session_options={"autoflush": False, "expire_on_commit": False})
+
+
+def utcnow():
+    """SQL expression for the current UTC time (columns are naive UTC timestamps)."""
+    return db.func.timezone("utc", db.func.now())
+
 
 from models.snapshot import Snapshot
 from models.holding import Holding
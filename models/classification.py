@@ -1,5 +1,4 @@
-from datetime import datetime, timezone
-from models import db
+from models import db, utcnow
 
 
 class TickerClassification(db.Model):
@@ -15,7 +14,7 @@ class TickerClassification(db.Model):
     # JSON: {"Technology": 30, "Financials": 13, ...} — 18 GICS-style sectors
     category_breakdown = db.Column(db.JSON, nullable=False, default=dict)
     classified_at = db.Column(
-        db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        db.DateTime, server_default=utcnow(), nullable=False
     )
     source = db.Column(
         db.String(20), default="ai"
@@ -5,7 +5,9 @@ class Holding(db.Model):
     __tablename__ = "holdings"
 
     id = db.Column(db.Integer, primary_key=True)
-    snapshot_id = db.Column(db.Integer, db.ForeignKey("snapshots.id"), nullable=False)
+    snapshot_id = db.Column(
+        db.Integer, db.ForeignKey("snapshots.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     ticker = db.Column(db.String(20), nullable=False)
     name = db.Column(db.String(200))
     quantity = db.Column(db.Float, nullable=False)
@@ -15,6 +17,8 @@ class Holding(db.Model):
     brokerage = db.Column(db.String(50), nullable=False)  # 'fidelity' or 'schwab'
     account = db.Column(db.String(100))
 
+    snapshot = db.relationship("Snapshot", back_populates="holdings")
+
     def to_dict(self):
         return {
             "id": self.id,
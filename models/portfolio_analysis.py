@@ -1,5 +1,6 @@
-from datetime import datetime, timezone, date
-from models import db
+from sqlalchemy.dialects.postgresql import insert
+
+from models import db, utcnow
 
 
 class PortfolioAnalysis(db.Model):
@@ -8,10 +9,10 @@ class PortfolioAnalysis(db.Model):
     __tablename__ = "portfolio_analyses"
 
     id = db.Column(db.Integer, primary_key=True)
-    snapshot_date = db.Column(db.Date, nullable=False, index=True)
+    snapshot_date = db.Column(db.Date, nullable=False, index=True, unique=True)
     analysis = db.Column(db.Text, nullable=False)
     created_at = db.Column(
-        db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        db.DateTime, server_default=utcnow(), nullable=False
     )
 
     def to_dict(self):
@@ -31,12 +32,12 @@ class PortfolioAnalysis(db.Model):
 
     @classmethod
     def save_for_date(cls, snap_date, analysis_text):
-        """Save (or replace) analysis for a date."""
-        existing = cls.query.filter_by(snapshot_date=snap_date).all()
-        for e in existing:
-            db.session.delete(e)
-
-        record = cls(snapshot_date=snap_date, analysis=analysis_text)
-        db.session.add(record)
+        """Save (or replace) analysis for a date in a single UPSERT."""
+        stmt = insert(cls).values(snapshot_date=snap_date, analysis=analysis_text)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.snapshot_date],
+            set_={"analysis": stmt.excluded.analysis, "created_at": utcnow()},
+        )
+        record = db.session.scalars(stmt.returning(cls)).one()
         db.session.commit()
         return record
@@ -1,5 +1,4 @@
-from datetime import datetime, timezone, date
-from models import db
+from models import db, utcnow
 
 
 class Snapshot(db.Model):
@@ -14,10 +13,34 @@ class Snapshot(db.Model):
     holding_count = db.Column(db.Integer, default=0)
     total_value = db.Column(db.Float, default=0)
     created_at = db.Column(
-        db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+        db.DateTime, server_default=utcnow(), nullable=False
     )
 
-    holdings = db.relationship("Holding", backref="snapshot", cascade="all, delete-orphan")
+    # passive_deletes: the FK's ON DELETE CASCADE removes holdings, so deleting
+    # a snapshot never lazy-loads the collection just to delete it row by row.
+    # lazy="raise": read holdings with one joined query (or selectinload), never
+    # by touching this attribute per snapshot
+    holdings = db.relationship(
+        "Holding",
+        back_populates="snapshot",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        # Matches the latest-snapshot-per-brokerage ordering
+        db.Index(
+            "ix_snapshots_brokerage_date_id",
+            brokerage, snapshot_date.desc(), id.desc(),
+        ),
+        # Per-date lookups: distinct snapshot dates and the latest snapshot
+        # per (date, brokerage) behind the trends chart
+        db.Index(
+            "ix_snapshots_date_brokerage_id",
+            snapshot_date, brokerage, id.desc(),
+        ),
+    )
 
     def to_dict(self):
         return {
@@ -0,0 +1,164 @@
+"""
+Shared CSV parsing for brokerage position exports.
+
+Each brokerage module describes its export format with a ParserSpec;
+parse_positions_csv() does the header scan, column resolution and row
+normalization for all of them.
+"""
+
+import csv
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Money-market / cash-equivalent tickers where price = $1.00 and shares = value
+CASH_TICKERS = frozenset({"SPAXX", "FDRXX", "FCASH", "SWVXX", "FZFXX", "SPRXX"})
+
+# Characters dropped from numeric cells: whitespace, quotes, $ and thousands separators
+_NUMBER_STRIP = str.maketrans("", "", '$," \t')
+
+# Placeholders exported for "no value"
+_EMPTY_NUMBERS = frozenset({"", "--", "N/A"})
+
+
+@dataclass(slots=True)
+class ParsedHolding:
+    """One normalized position row from a brokerage export."""
+
+    ticker: str
+    name: str
+    quantity: float
+    price: float
+    value: float
+    cost_basis: float
+    brokerage: str
+    account: str
+
+
+@dataclass(frozen=True, slots=True)
+class ParserSpec:
+    """How one brokerage lays out its positions export."""
+
+    brokerage: str
+    # The header row contains "Symbol" and at least one of these
+    header_markers: tuple[str, ...]
+    # Listed in the "could not find header row" error
+    expected_columns: str
+    # Candidate column names per field, in preference order
+    name_columns: tuple[str, ...]
+    quantity_columns: tuple[str, ...]
+    price_columns: tuple[str, ...]
+    value_columns: tuple[str, ...]
+    cost_basis_columns: tuple[str, ...]
+    account_columns: tuple[str, ...] = ()
+    # Characters trimmed from the symbol / name cells after whitespace
+    ticker_strip: str = ""
+    name_strip: str = ""
+    # Symbols that are not positions: exact matches, or containing this text
+    skip_tickers: frozenset[str] = frozenset()
+    skip_containing: str = ""
+    # Take the account from the first non-empty line above the header
+    account_from_preamble: bool = False
+
+
+def parse_positions_csv(lines: Iterable[str], spec: ParserSpec) -> list[ParsedHolding]:
+    """Parse a positions CSV (any iterable of lines, e.g. a text stream) laid out as `spec` describes."""
+    holdings = []
+
+    # Exports often have junk above the header — skip until we find it
+    lines = iter(lines)
+    preamble_account = ""
+    for line in lines:
+        if "Symbol" in line and any(marker in line for marker in spec.header_markers):
+            header = line
+            break
+        if spec.account_from_preamble and not preamble_account:
+            line = line.strip().strip('"')
+            if line and not line.startswith(","):
+                preamble_account = line
+    else:
+        raise ValueError(
+            f"Could not find header row in {spec.brokerage.title()} CSV. "
+            f"Expected columns: {spec.expected_columns}"
+        )
+
+    # Resolve column positions once; rows are then indexed, not dict-built
+    header = next(csv.reader([header]))
+    symbol_col = _column_indices(header, "Symbol")
+    name_cols = _column_indices(header, *spec.name_columns)
+    quantity_cols = _column_indices(header, *spec.quantity_columns)
+    price_cols = _column_indices(header, *spec.price_columns)
+    value_cols = _column_indices(header, *spec.value_columns)
+    cost_basis_cols = _column_indices(header, *spec.cost_basis_columns)
+    account_cols = _column_indices(header, *spec.account_columns)
+
+    for row in csv.reader(lines):
+        ticker = _cell(row, symbol_col).strip().strip(spec.ticker_strip).upper()
+        if not ticker:
+            continue
+
+        # Skip non-position rows (totals, pending activity, ...)
+        if ticker in spec.skip_tickers:
+            continue
+        if spec.skip_containing and spec.skip_containing in ticker:
+            continue
+
+        quantity = _parse_number(_cell(row, quantity_cols))
+        value = _parse_number(_cell(row, value_cols))
+
+        # Skip rows with no value
+        if value == 0 and quantity == 0:
+            continue
+
+        price = _parse_number(_cell(row, price_cols))
+        cost_basis = _parse_number(_cell(row, cost_basis_cols))
+
+        # Money-market funds: price is always $1, shares = dollar value,
+        # and cost basis equals the current value
+        if ticker in CASH_TICKERS and value:
+            if not quantity or not price:
+                price = 1.0
+                quantity = value
+            if not cost_basis:
+                cost_basis = value
+
+        holdings.append(
+            ParsedHolding(
+                ticker=ticker,
+                name=_cell(row, name_cols).strip().strip(spec.name_strip),
+                quantity=quantity,
+                price=price,
+                value=value,
+                cost_basis=cost_basis,
+                brokerage=spec.brokerage,
+                account=_cell(row, account_cols).strip() or preamble_account,
+            )
+        )
+
+    return holdings
+
+
+def _column_indices(header: list[str], *names: str) -> tuple[int, ...]:
+    """Positions of whichever of the candidate column names the header has, in preference order."""
+    positions = {name: i for i, name in enumerate(header)}
+    return tuple(positions[name] for name in names if name in positions)
+
+
+def _cell(row: list[str], columns: tuple[int, ...]) -> str:
+    """First non-empty cell among the given column positions."""
+    for i in columns:
+        if i < len(row) and row[i]:
+            return row[i]
+    return ""
+
+
+def _parse_number(s: str) -> float:
+    """Parse a number string, stripping $, commas, quotes, etc."""
+    if not s:
+        return 0.0
+    s = s.translate(_NUMBER_STRIP)
+    if s in _EMPTY_NUMBERS:
+        return 0.0
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
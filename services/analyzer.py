@@ -3,11 +3,7 @@ Portfolio AI analysis — sends holdings data to Perplexity and returns
 a formatted analysis covering risk, world-view, geopolitics, and macro themes.
 """
 
-import json
-import os
-import re
-
-from openai import OpenAI
+from services.perplexity import get_api_key, get_client
 
 
 ANALYSIS_PROMPT = """\
@@ -43,6 +39,30 @@ Portfolio data:
 """
 
 
+def _portfolio_summary(breakdown: dict) -> str:
+    """Compact Markdown summary of the breakdown for the prompt, built in one join."""
+    return "\n".join([
+        f"Total portfolio value: ${breakdown['total_value']:,.2f}\n",
+        "### Category Breakdown",
+        *(f"- {cat}: {info['pct']}% (${info['value']:,.0f})"
+          for cat, info in breakdown["by_category"].items()),
+        "\n### Region Breakdown",
+        *(f"- {reg}: {info['pct']}% (${info['value']:,.0f})"
+          for reg, info in breakdown["by_region"].items()),
+        "\n### Top Holdings (by value)",
+        *(_holding_line(h) for h in breakdown["holdings"][:25]),
+    ])
+
+
+def _holding_line(h: dict) -> str:
+    cat_str = ", ".join(f"{k} {v}%" for k, v in (h.get("category") or {}).items())
+    reg_str = ", ".join(f"{k} {v}%" for k, v in (h.get("region") or {}).items())
+    return (
+        f"- {h['ticker']}: ${h['value']:,.0f} ({h['pct']}%) "
+        f"| type={h.get('security_type', '?')} | cat=[{cat_str}] | reg=[{reg_str}]"
+    )
+
+
 def generate_analysis(breakdown: dict) -> str:
     """
     Call Perplexity to generate a portfolio analysis.
@@ -53,41 +73,14 @@ def generate_analysis(breakdown: dict) -> str:
     Returns:
         Markdown-formatted analysis string
     """
-    api_key = os.environ.get("PERPLEXITY_API_KEY", "")
-    if not api_key or api_key.startswith("pplx-your"):
+    api_key = get_api_key()
+    if not api_key:
         return "**API key not configured.** Set PERPLEXITY_API_KEY in your .env file."
 
-    # Build a compact data summary for the prompt
-    total = breakdown["total_value"]
-    lines = [f"Total portfolio value: ${total:,.2f}\n"]
-
-    lines.append("### Category Breakdown")
-    for cat, info in breakdown["by_category"].items():
-        lines.append(f"- {cat}: {info['pct']}% (${info['value']:,.0f})")
-
-    lines.append("\n### Region Breakdown")
-    for reg, info in breakdown["by_region"].items():
-        lines.append(f"- {reg}: {info['pct']}% (${info['value']:,.0f})")
-
-    lines.append("\n### Top Holdings (by value)")
-    for h in breakdown["holdings"][:25]:
-        cat_str = ", ".join(f"{k} {v}%" for k, v in (h.get("category") or {}).items())
-        reg_str = ", ".join(f"{k} {v}%" for k, v in (h.get("region") or {}).items())
-        lines.append(
-            f"- {h['ticker']}: ${h['value']:,.0f} ({h['pct']}%) "
-            f"| type={h.get('security_type', '?')} | cat=[{cat_str}] | reg=[{reg_str}]"
-        )
-
-    data_text = "\n".join(lines)
-    prompt = ANALYSIS_PROMPT + data_text
-
-    client = OpenAI(
-        api_key=api_key,
-        base_url="https://api.perplexity.ai",
-    )
+    prompt = ANALYSIS_PROMPT + _portfolio_summary(breakdown)
 
     try:
-        response = client.chat.completions.create(
+        response = get_client(api_key).chat.completions.create(
             model="sonar",
             messages=[
                 {
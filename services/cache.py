@@ -0,0 +1,27 @@
+"""
+In-process version counters for read-mostly API payloads.
+
+Payloads that only change on known writes (targets, classifications, ...)
+are memoized keyed by the resource's current version. Write paths call
+bump() and the next read rebuilds the payload.
+
+Counters live in this process only, which matches the single gunicorn
+worker we deploy with.
+"""
+
+import itertools
+
+# One global clock so every bump yields a fresh, never-reused version
+_clock = itertools.count(1)
+_versions: dict[str, int] = {}
+
+
+def version(resource: str) -> int:
+    """Current version of a resource (0 until first bumped)."""
+    return _versions.get(resource, 0)
+
+
+def bump(*resources: str):
+    """Invalidate cached payloads for the given resources."""
+    for resource in resources:
+        _versions[resource] = next(_clock)
@@ -5,9 +5,11 @@ ETF classifications live in etf_classifications.json (same directory).
 To regenerate, ask AI to output fresh JSON matching that format.
 """
 
-import json
+from functools import cache
 from pathlib import Path
 
+import orjson
+
 # ── Valid dimensions ──────────────────────────────────────────────────────
 
 VALID_CATEGORIES = [
@@ -38,14 +40,28 @@ VALID_REGIONS = ["US", "DM", "EM", "Global"]
 
 _JSON_PATH = Path(__file__).parent / "etf_classifications.json"
 
-def _load_builtin_map() -> dict:
-    """Load ETF classification map from JSON, skipping the _meta key."""
-    with open(_JSON_PATH) as f:
-        data = json.load(f)
+@cache
+def get_builtin_map() -> dict:
+    """ETF classification map from JSON (minus the _meta key), parsed once on first use."""
+    data = orjson.loads(_JSON_PATH.read_bytes())
     data.pop("_meta", None)
+
+    # Many funds repeat the same template (e.g. total-market sector weights,
+    # {"US": 100}); keep one shared dict per distinct breakdown. Treat them
+    # as read-only.
+    shared = {}
+    for entry in data.values():
+        for dim in ("region", "category"):
+            breakdown = entry[dim]
+            entry[dim] = shared.setdefault((dim, tuple(breakdown.items())), breakdown)
     return data
 
-BUILTIN_MAP = _load_builtin_map()
+
+def __getattr__(name):
+    # Keep `BUILTIN_MAP` importable without parsing the JSON at import time
+    if name == "BUILTIN_MAP":
+        return get_builtin_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ── AI prompt template ───────────────────────────────────────────────────
@@ -2,7 +2,7 @@
 Ticker classifier.
 
 Classification priority:
-  1. DB cache  — already classified, skip
+  1. DB cache  — already classified, skip (fronted by an in-process map)
   2. BUILTIN_MAP — curated ETF/fund mappings (source="builtin")
   3. Perplexity AI — only for unknown tickers (source="ai")
   4. Fallback — defaults to US / Other (source="fallback")
@@ -11,21 +11,39 @@ Categories, regions, ETF mappings, and the AI prompt are in
 services/classifications_config.py.
 """
 
-import json
-import os
-import re
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from openai import OpenAI
+import orjson
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 
-from models import db
+from models import db, utcnow
 from models.classification import TickerClassification
+from services import cache
 from services.classifications_config import (
-    BUILTIN_MAP,
     CLASSIFICATION_PROMPT,
     VALID_CATEGORIES,
     VALID_REGIONS,
+    get_builtin_map,
 )
+from services.perplexity import get_api_key, get_client
+
+# Classifications this process has already read, by ticker. Emptied whenever
+# the "classifications" cache version moves (every write bumps it), so it never
+# serves a row that changed underneath it. Request threads and the upload
+# worker share it; take _known_lock for every access
+_known: dict[str, dict] = {}
+_known_version = cache.version("classifications")
+_known_lock = threading.Lock()
+
+# Shared by every fallback row rather than rebuilt per ticker; read-only
+_DEFAULT_CLASSIFICATION = {"region": {"US": 100}, "category": {"Other": 100}}
+
+# One prompt for a long ticker list is one long, serial completion; classify
+# in shards on a few threads instead (kept small for Perplexity's rate limit)
+_AI_BATCH_SIZE = 20
+_ai_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="classify")
 
 
 def classify_tickers(tickers_with_names: list[tuple[str, str]]) -> dict:
@@ -37,38 +55,65 @@ def classify_tickers(tickers_with_names: list[tuple[str, str]]) -> dict:
 
     Returns:
         dict mapping ticker -> {"region": {...}, "category": {...}, "source": ...}
+        (a ticker manually edited while it was being classified is left out)
     """
     if not tickers_with_names:
         return {}
 
-    tickers = [t for t, _ in tickers_with_names]
-
-    # 1) Check DB cache
-    existing = TickerClassification.query.filter(
-        TickerClassification.ticker.in_(tickers)
-    ).all()
-    existing_map = {c.ticker: c for c in existing}
-
-    to_classify = [
-        (t, n) for t, n in tickers_with_names if t not in existing_map
-    ]
+    # Unique tickers, in input order
+    tickers = list(dict.fromkeys(t for t, _ in tickers_with_names))
+
+    global _known_version
+    with _known_lock:
+        version = cache.version("classifications")
+        if _known_version != version:
+            _known.clear()
+            _known_version = version
+        classifications = {t: _known[t] for t in tickers if t in _known}
+
+    # 1) Check DB cache — a single IN (...) lookup for tickers this process
+    # hasn't seen yet; these rows are also the result for classified tickers
+    unseen = [t for t in tickers if t not in classifications]
+    if unseen:
+        found = {}
+        for ticker, region, category, source in db.session.execute(
+            select(
+                TickerClassification.ticker,
+                TickerClassification.region_breakdown,
+                TickerClassification.category_breakdown,
+                TickerClassification.source,
+            ).where(TickerClassification.ticker.in_(unseen))
+        ):
+            found[ticker] = {"region": region, "category": category, "source": source}
+        classifications.update(found)
+        with _known_lock:
+            # Only remember rows if no write was announced since `version`
+            if _known_version == version == cache.version("classifications"):
+                _known.update(found)
+
+    # One row per new ticker (the same ticker may arrive with several names)
+    to_classify = {}
+    for ticker, name in tickers_with_names:
+        if ticker not in classifications:
+            to_classify.setdefault(ticker, name)
 
     if to_classify:
+        rows = []
+
         # 2) Resolve from builtin map first
+        builtin_map = get_builtin_map()
         need_ai = []
-        for ticker, name in to_classify:
-            if ticker in BUILTIN_MAP:
-                _save_classification(ticker, name, BUILTIN_MAP[ticker], source="builtin")
+        for ticker, name in to_classify.items():
+            if ticker in builtin_map:
+                rows.append(_classification_row(ticker, name, builtin_map[ticker], source="builtin"))
             else:
                 need_ai.append((ticker, name))
 
         # 3) Call AI for remaining unknowns
         if need_ai:
-            api_key = os.environ.get("PERPLEXITY_API_KEY", "")
-            has_key = api_key and not api_key.startswith("pplx-your")
-
-            if has_key:
-                ai_results = _call_perplexity(need_ai, api_key)
+            api_key = get_api_key()
+            if api_key:
+                ai_results = _classify_with_ai(need_ai, api_key)
             else:
                 ai_results = {}
 
@@ -76,51 +121,79 @@ def classify_tickers(tickers_with_names: list[tuple[str, str]]) -> dict:
                 raw = ai_results.get(ticker)
                 if raw:
                     result = _normalize(raw)
-                    _save_classification(ticker, name, result, source="ai")
+                    rows.append(_classification_row(ticker, name, result, source="ai"))
                 else:
-                    _save_classification(ticker, name, _default_classification(), source="fallback")
-
+                    rows.append(_classification_row(ticker, name, _default_classification(), source="fallback"))
+
+        # One upsert for the whole batch. A ticker a concurrent request
+        # classified meanwhile is overwritten — unless that was a manual
+        # edit, which wins; RETURNING reports the rows actually written
+        stmt = insert(TickerClassification)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TickerClassification.ticker],
+            set_={
+                "name": stmt.excluded.name,
+                "region_breakdown": stmt.excluded.region_breakdown,
+                "category_breakdown": stmt.excluded.category_breakdown,
+                "source": stmt.excluded.source,
+                "classified_at": utcnow(),
+            },
+            where=TickerClassification.source != "manual",
+        ).returning(TickerClassification.ticker)
+        written = set(db.session.scalars(stmt, rows))
         db.session.commit()
 
-    # Reload all classifications
-    all_classifications = TickerClassification.query.filter(
-        TickerClassification.ticker.in_(tickers)
-    ).all()
+        # Build the result from what was just written instead of reloading it;
+        # a skipped ticker's manual row is read from the table on its next lookup
+        for row in rows:
+            if row["ticker"] in written:
+                classifications[row["ticker"]] = {
+                    "region": row["region_breakdown"],
+                    "category": row["category_breakdown"],
+                    "source": row["source"],
+                }
+
+        # New rows change every breakdown. The bump also empties _known on the
+        # next call, since another writer's bump can't be told apart from ours
+        cache.bump("classifications")
 
+    return classifications
+
+
+def _classification_row(ticker: str, name: str, data: dict, source: str) -> dict:
+    """Build a TickerClassification insert mapping."""
     return {
-        c.ticker: {
-            "region": c.region_breakdown,
-            "category": c.category_breakdown,
-            "source": c.source,
-        }
-        for c in all_classifications
+        "ticker": ticker,
+        "name": name,
+        "region_breakdown": data.get("region", _DEFAULT_CLASSIFICATION["region"]),
+        "category_breakdown": data.get("category", _DEFAULT_CLASSIFICATION["category"]),
+        "source": source,
     }
 
 
-def _save_classification(ticker: str, name: str, data: dict, source: str):
-    """Merge a classification into the DB (not yet committed)."""
-    classification = TickerClassification(
-        ticker=ticker,
-        name=name,
-        region_breakdown=data.get("region", {"US": 100}),
-        category_breakdown=data.get("category", {"Other": 100}),
-        classified_at=datetime.now(timezone.utc),
-        source=source,
-    )
-    db.session.merge(classification)
+def _classify_with_ai(tickers_with_names: list[tuple[str, str]], api_key: str) -> dict:
+    """_call_perplexity over _AI_BATCH_SIZE shards, run concurrently and merged."""
+    shards = [
+        tickers_with_names[i:i + _AI_BATCH_SIZE]
+        for i in range(0, len(tickers_with_names), _AI_BATCH_SIZE)
+    ]
+    results = {}
+    for shard_result in _ai_pool.map(lambda shard: _call_perplexity(shard, api_key), shards):
+        # A failed shard returns {} and its tickers fall back on their own;
+        # so does a reply that parsed to something other than a JSON object
+        if isinstance(shard_result, dict):
+            results.update(shard_result)
+    return results
 
 
 def _call_perplexity(tickers_with_names: list[tuple[str, str]], api_key: str) -> dict:
     """Call Perplexity API for unknown tickers. Returns raw parsed JSON."""
-    ticker_list = "\n".join(
+    ticker_list = "\n".join([
         f"- {ticker} ({name})" for ticker, name in tickers_with_names
-    )
+    ])
     prompt = CLASSIFICATION_PROMPT + ticker_list
 
-    client = OpenAI(
-        api_key=api_key,
-        base_url="https://api.perplexity.ai",
-    )
+    client = get_client(api_key)
 
     try:
         response = client.chat.completions.create(
@@ -134,11 +207,12 @@ def _call_perplexity(tickers_with_names: list[tuple[str, str]], api_key: str) ->
 
         content = response.choices[0].message.content
         # Perplexity may wrap JSON in markdown code blocks
-        if "```" in content:
-            match = re.search(r"```(?:json)?\s*([\s\S]*?)```", content)
-            if match:
-                content = match.group(1).strip()
-        return json.loads(content)
+        _, fence, rest = content.partition("```")
+        if fence:
+            fenced, closed, _ = rest.partition("```")
+            if closed:
+                content = fenced.removeprefix("json").strip()
+        return orjson.loads(content)
     except Exception as e:
         print(f"[classifier] Perplexity API error: {e}")
         return {}
@@ -151,7 +225,7 @@ def _normalize(data: dict) -> dict:
         if key in data.get("region", {}):
             region[key] = data["region"][key]
     if not region:
-        region = {"US": 100}
+        region = _DEFAULT_CLASSIFICATION["region"]
     else:
         total = sum(region.values())
         if total > 0 and total != 100:
@@ -162,7 +236,7 @@ def _normalize(data: dict) -> dict:
         if key in data.get("category", {}):
             category[key] = data["category"][key]
     if not category:
-        category = {"Other": 100}
+        category = _DEFAULT_CLASSIFICATION["category"]
     else:
         total = sum(category.values())
         if total > 0 and total != 100:
@@ -175,9 +249,10 @@ def reclassify_ticker(ticker: str, name: str) -> dict:
     """Force reclassify a single ticker (delete cache and re-run AI)."""
     TickerClassification.query.filter_by(ticker=ticker).delete()
     db.session.commit()
+    cache.bump("classifications")  # also drops the deleted row from _known
     return classify_tickers([(ticker, name)])
 
 
 def _default_classification():
     """Default classification for unknown tickers."""
-    return {"region": {"US": 100}, "category": {"Other": 100}}
+    return _DEFAULT_CLASSIFICATION
@@ -0,0 +1,30 @@
+"""
+Shared Perplexity API client.
+
+Perplexity speaks the OpenAI chat-completions protocol; classification
+and analysis both go through one cached client per API key, so they share
+a single HTTP connection pool.
+"""
+
+import os
+from functools import lru_cache
+
+from openai import OpenAI
+
+
+def get_api_key() -> str:
+    """PERPLEXITY_API_KEY, or "" when unset or still the "pplx-your..." placeholder.
+
+    Read on every call so a rotated key is picked up without a restart.
+    """
+    api_key = os.environ.get("PERPLEXITY_API_KEY", "")
+    return "" if api_key.startswith("pplx-your") else api_key
+
+
+@lru_cache(maxsize=4)
+def get_client(api_key: str) -> OpenAI:
+    """Perplexity client per API key, reused so calls share one HTTP connection pool."""
+    return OpenAI(
+        api_key=api_key,
+        base_url="https://api.perplexity.ai",
+    )
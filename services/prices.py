@@ -5,8 +5,38 @@ Fetches current market prices for a list of tickers and applies them
 to snapshot holdings to compute a live portfolio valuation.
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 import yfinance as yf
 
+# fast_info makes one quote request per ticker; fan them out instead of
+# paying each round-trip serially
+_MAX_FETCH_THREADS = 16
+_fetch_pool = ThreadPoolExecutor(max_workers=_MAX_FETCH_THREADS, thread_name_prefix="prices")
+
+# The three live endpoints ask for the same tickers seconds apart; reuse a
+# quote (or a miss) for a short while: {ticker: (price, fetched_at)}
+PRICE_TTL_SECONDS = 30
+_quote_cache: dict[str, tuple[float | None, float]] = {}
+_quote_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class LiveHolding:
+    """A holding revalued at live prices — quacks like Holding for compute_breakdown(), never persisted."""
+
+    ticker: str
+    name: str
+    quantity: float
+    price: float
+    value: float
+    cost_basis: float | None
+    brokerage: str
+    account: str
+
 
 def fetch_live_prices(tickers: list[str]) -> dict[str, float]:
     """
@@ -18,24 +48,41 @@ def fetch_live_prices(tickers: list[str]) -> dict[str, float]:
     if not tickers:
         return {}
 
-    # yfinance handles batching internally
-    data = yf.Tickers(" ".join(tickers))
-
+    # Callers may pass the same ticker for several accounts; look each up once
+    tickers = list(dict.fromkeys(tickers))
+    now = time.monotonic()
     prices = {}
-    for ticker in tickers:
-        try:
-            info = data.tickers[ticker].fast_info
-            # Use last price (most recent trade price)
-            price = getattr(info, "last_price", None)
-            if price is None:
-                price = getattr(info, "previous_close", None)
-            prices[ticker] = round(price, 4) if price else None
-        except Exception:
-            prices[ticker] = None
+    with _quote_lock:
+        for ticker in tickers:
+            cached = _quote_cache.get(ticker)
+            if cached and now - cached[1] < PRICE_TTL_SECONDS:
+                prices[ticker] = cached[0]
+    misses = [t for t in tickers if t not in prices]
+    if not misses:
+        return prices
 
+    data = yf.Tickers(" ".join(misses))
+    quotes = dict(zip(misses, _fetch_pool.map(lambda t: _last_price(data.tickers.get(t)), misses)))
+    with _quote_lock:
+        for ticker, price in quotes.items():
+            _quote_cache[ticker] = (price, now)
+    prices.update(quotes)
     return prices
 
 
+def _last_price(ticker) -> float | None:
+    """Most recent trade price for a yfinance Ticker, falling back to the previous close."""
+    try:
+        info = ticker.fast_info
+        # Use last price (most recent trade price)
+        price = getattr(info, "last_price", None)
+        if price is None:
+            price = getattr(info, "previous_close", None)
+        return round(price, 4) if price else None
+    except Exception:
+        return None
+
+
 def apply_live_prices(holdings, live_prices: dict[str, float]) -> list[dict]:
     """
     Take snapshot holdings and apply live prices to compute updated values.
@@ -5,14 +5,28 @@ Given current holdings with classifications and target allocations,
 compute the drift and recommend trades to rebalance.
 """
 
+from operator import itemgetter
+
+import numpy as np
+from sqlalchemy import select
+
+from models import db
 from models.holding import Holding
 from models.classification import TickerClassification
 from models.target import TargetAllocation
-from services.classifications_config import BUILTIN_MAP
+from services.classifications_config import get_builtin_map
 
 # Tickers we know are cash-equivalent money market funds
 _CASH_TICKERS = {"SPAXX", "FDRXX", "FCASH", "SWVXX", "FZFXX", "SPRXX"}
 
+# Breakdown assumed for a ticker with no (or an empty) classification row;
+# compute_breakdown() and the trends view must agree on it. Shared, read-only
+UNCLASSIFIED_REGION = {"US": 100}
+UNCLASSIFIED_CATEGORY = {"Equities": 100}
+
+# Below this many tickers the plain dict loop is faster than building arrays
+_VECTORIZE_MIN_TICKERS = 200
+
 
 def _infer_security_type(ticker: str, category_bd: dict) -> str:
     """Derive security type from ticker and classification."""
@@ -20,7 +34,7 @@ def _infer_security_type(ticker: str, category_bd: dict) -> str:
     if ticker in _CASH_TICKERS or category_bd.get("Cash", 0) == 100:
         return "Cash"
     # Known ETFs from our builtin map
-    if ticker in BUILTIN_MAP:
+    if ticker in get_builtin_map():
         return "ETF"
     # Mutual funds: typically 5 chars ending in X
     if len(ticker) == 5 and ticker.endswith("X"):
@@ -28,6 +42,34 @@ def _infer_security_type(ticker: str, category_bd: dict) -> str:
     return "Stock"
 
 
+def _distribute(values: list[float], breakdowns: list[dict]) -> dict[str, float]:
+    """
+    Spread each value across its breakdown ({label: pct}) and total per label.
+
+    Large portfolios use one (tickers x labels) weight-matrix product;
+    labels keep first-seen order either way.
+    """
+    if len(values) < _VECTORIZE_MIN_TICKERS:
+        totals = {}
+        for value, breakdown in zip(values, breakdowns):
+            for label, pct in breakdown.items():
+                totals[label] = totals.get(label, 0) + value * pct / 100
+        return totals
+
+    labels = {}
+    rows, cols, weights = [], [], []
+    for i, breakdown in enumerate(breakdowns):
+        for label, pct in breakdown.items():
+            rows.append(i)
+            cols.append(labels.setdefault(label, len(labels)))
+            weights.append(pct)
+
+    matrix = np.zeros((len(values), len(labels)))
+    matrix[rows, cols] = weights
+    totals = np.asarray(values) @ matrix / 100
+    return dict(zip(labels, totals.tolist()))
+
+
 def compute_breakdown(holdings: list[Holding]) -> dict:
     """
     Compute the aggregated portfolio breakdown by region and category.
@@ -43,11 +85,6 @@ def compute_breakdown(holdings: list[Holding]) -> dict:
             ]
         }
     """
-    classifications = {
-        c.ticker: c
-        for c in TickerClassification.query.all()
-    }
-
     total_value = sum(h.value for h in holdings)
     if total_value == 0:
         return {
@@ -57,15 +94,28 @@ def compute_breakdown(holdings: list[Holding]) -> dict:
             "holdings": [],
         }
 
-    region_totals = {}
-    category_totals = {}
+    # Only the portfolio's own tickers: {ticker: (region_breakdown, category_breakdown)}
+    classifications = {
+        ticker: (region, category)
+        for ticker, region, category in db.session.execute(
+            select(
+                TickerClassification.ticker,
+                TickerClassification.region_breakdown,
+                TickerClassification.category_breakdown,
+            ).where(TickerClassification.ticker.in_(list({h.ticker for h in holdings})))
+        )
+    }
+
     holding_details = []
+    values, region_bds, category_bds = [], [], []
 
     # Aggregate same-ticker holdings across brokerages
     ticker_values = {}
     for h in holdings:
-        if h.ticker not in ticker_values:
-            ticker_values[h.ticker] = {
+        info = ticker_values.get(h.ticker)
+        if info is None:
+            # First row for a ticker names it
+            info = ticker_values[h.ticker] = {
                 "ticker": h.ticker,
                 "name": h.name,
                 "value": 0,
@@ -73,29 +123,20 @@ def compute_breakdown(holdings: list[Holding]) -> dict:
                 "cost_basis": 0,
                 "brokerages": set(),
             }
-        ticker_values[h.ticker]["value"] += h.value
-        ticker_values[h.ticker]["quantity"] += h.quantity
-        ticker_values[h.ticker]["cost_basis"] += (h.cost_basis or 0)
-        ticker_values[h.ticker]["brokerages"].add(h.brokerage)
+        info["value"] += h.value
+        info["quantity"] += h.quantity
+        info["cost_basis"] += (h.cost_basis or 0)
+        info["brokerages"].add(h.brokerage)
 
     for ticker, info in ticker_values.items():
         value = info["value"]
-        classification = classifications.get(ticker)
-
-        if classification:
-            region_bd = classification.region_breakdown or {"US": 100}
-            category_bd = classification.category_breakdown or {"Equities": 100}
-        else:
-            region_bd = {"US": 100}
-            category_bd = {"Equities": 100}
+        region_bd, category_bd = classifications.get(ticker, (None, None))
+        region_bd = region_bd or UNCLASSIFIED_REGION
+        category_bd = category_bd or UNCLASSIFIED_CATEGORY
 
-        # Distribute value across regions
-        for region, pct in region_bd.items():
-            region_totals[region] = region_totals.get(region, 0) + value * pct / 100
-
-        # Distribute value across categories
-        for cat, pct in category_bd.items():
-            category_totals[cat] = category_totals.get(cat, 0) + value * pct / 100
+        values.append(value)
+        region_bds.append(region_bd)
+        category_bds.append(category_bd)
 
         holding_details.append(
             {
@@ -114,18 +155,22 @@ def compute_breakdown(holdings: list[Holding]) -> dict:
             }
         )
 
+    # Distribute values across regions and categories
+    region_totals = _distribute(values, region_bds)
+    category_totals = _distribute(values, category_bds)
+
     # Sort by value descending
-    holding_details.sort(key=lambda x: x["value"], reverse=True)
+    holding_details.sort(key=itemgetter("value"), reverse=True)
 
     return {
         "total_value": round(total_value, 2),
         "by_region": {
             k: {"value": round(v, 2), "pct": round(v / total_value * 100, 2)}
-            for k, v in sorted(region_totals.items(), key=lambda x: -x[1])
+            for k, v in sorted(region_totals.items(), key=itemgetter(1), reverse=True)
         },
         "by_category": {
             k: {"value": round(v, 2), "pct": round(v / total_value * 100, 2)}
-            for k, v in sorted(category_totals.items(), key=lambda x: -x[1])
+            for k, v in sorted(category_totals.items(), key=itemgetter(1), reverse=True)
         },
         "holdings": holding_details,
     }
@@ -169,12 +214,14 @@ def compute_rebalance(breakdown: dict, dimension: str = "category") -> list[dict
         return []
 
     # Collect all labels from both current and targets
-    all_labels = sorted(set(list(current.keys()) + list(targets.keys())))
+    all_labels = sorted(current.keys() | targets.keys())
 
     result = []
     for label in all_labels:
-        current_pct = current.get(label, {}).get("pct", 0) if isinstance(current.get(label), dict) else 0
-        current_value = current.get(label, {}).get("value", 0) if isinstance(current.get(label), dict) else 0
+        # by_region / by_category always map label -> {"value", "pct"}
+        entry = current.get(label) or {}
+        current_pct = entry.get("pct", 0)
+        current_value = entry.get("value", 0)
         target_pct = targets.get(label, 0)
         target_value = total_value * target_pct / 100
         drift = round(current_pct - target_pct, 2)
@@ -112,16 +112,23 @@ async function uploadCSV() {
         return;
     }
 
-    const formData = new FormData();
-    formData.append('file', fileInput.files[0]);
-    formData.append('brokerage', brokerage);
-    formData.append('snapshot_date', dateInput.value);
+    // Send the file as the raw request body; metadata rides in the query string
+    const file = fileInput.files[0];
+    const params = new URLSearchParams({
+        brokerage,
+        snapshot_date: dateInput.value,
+        filename: file.name,
+    });
 
     statusEl.textContent = 'Uploading and classifying...';
     statusEl.className = 'status-msg';
 
     try {
-        const res = await fetch('/api/upload', { method: 'POST', body: formData });
+        const res = await fetch('/api/upload?' + params, {
+            method: 'POST',
+            headers: { 'Content-Type': 'text/csv' },
+            body: file,
+        });
         const data = await res.json();
 
         if (!res.ok) {
@@ -139,12 +146,45 @@ async function uploadCSV() {
         await loadBreakdown();
         invalidateTrends();
         switchTab('holdings');
+
+        // New tickers are classified in the background — refresh once the job finishes
+        if (data.classification_pending) {
+            statusEl.textContent = data.message + ' — classifying new tickers...';
+            const job = await waitForJob(data.job_id);
+            statusEl.textContent = data.message;
+            if (!job) {
+                statusEl.textContent += ' — classification still running; refresh later';
+            } else if (job.status === 'failed') {
+                statusEl.textContent += ' — classification failed: ' + job.error;
+                statusEl.className = 'status-msg error';
+            } else if (job.analysis_error) {
+                statusEl.textContent += ' — AI analysis failed: ' + job.analysis_error;
+            }
+            await loadBreakdown();
+            invalidateTrends();
+        }
     } catch (err) {
         statusEl.textContent = 'Network error: ' + err.message;
         statusEl.className = 'status-msg error';
     }
 }
 
+async function waitForJob(jobId, timeoutMs = 120000) {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        try {
+            const res = await fetch(`/api/jobs/${jobId}`);
+            if (!res.ok) return null;
+            const job = await res.json();
+            if (job.status === 'done' || job.status === 'failed') return job;
+        } catch (err) {
+            console.error('Failed to poll upload job:', err);
+        }
+    }
+    return null;
+}
+
 // ── Breakdown ───────────────────────────────────────────
 async function loadBreakdown() {
     if (liveMode) {